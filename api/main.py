@@ -46,15 +46,18 @@ class QuestionModel(BaseModel):
 @app.get("/q/{q}")
 async def get_literature_review(q: str, SS_key=None):
     print('[GET] New Question:', q)
-    print('[GET] SemanticScholar key:', SS_key)
 
     try:
         if q is None:
             return "type a question after /q/type your question here "
+        # literature_review blocks until the review is done, so keep it off the server's loop
+        loop = asyncio.get_running_loop()
         if SS_key is None:
-            researcher = literature_review(q)
+            researcher = await loop.run_in_executor(None, literature_review, q)
         else:
-            researcher = literature_review(q, None, SS_key)
+            researcher = await loop.run_in_executor(
+                None, literature_review, q, None, SS_key
+            )
         return researcher
     except BrowserError as e:
         return {"error": str(e)}
@@ -68,7 +71,8 @@ async def get_literature_review(request: QuestionModel):
     q = request.research_question
     print('[POST] New Question:', q)
     try:
-        researcher = literature_review(q)
+        loop = asyncio.get_running_loop()
+        researcher = await loop.run_in_executor(None, literature_review, q)
         return {"researcher": researcher}
     except BrowserError as e:
         return {"error": str(e)}
@@ -1 +1,5 @@
+import logging
+
 from .workflows.literature_review.literature_review import literature_review
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -1,10 +1,20 @@
+import random
 import requests
+import time
 from abc import ABC, abstractmethod
+from requests.adapters import HTTPAdapter
+
+# Retry settings for rate limits and transient server errors
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1
 
 
 class BaseWebAPIDataLoader(ABC):
     def __init__(self, base_url):
         self.base_url = base_url
+        # Reuse connections across requests, including concurrent ones
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
     @abstractmethod
     def fetch_data(self, search_query, **kwargs):
@@ -30,12 +40,30 @@ class BaseWebAPIDataLoader(ABC):
           dict: The response from the API.
         Raises:
           Exception: If the request fails.
+        Notes:
+          Rate limit (429) and server (5xx) errors are retried up to `MAX_RETRIES` times. The delay
+          follows the Retry-After header if the API sends one, otherwise an exponential backoff,
+          plus random jitter so that concurrent requests do not retry in lockstep.
         """
         url = f"{self.base_url}{endpoint}"
-        response = requests.get(url, params=params)
+        for attempt in range(MAX_RETRIES):
+            response = self.session.get(url, params=params)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or attempt == MAX_RETRIES - 1:
+                break
+            time.sleep(self._retry_delay(response, attempt))
 
         if response.status_code == 200:
             data = response.json()
             return data
         else:
             raise Exception(f"Failed to fetch data from API: {response.status_code}")
+
+    @staticmethod
+    def _retry_delay(response, attempt):
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = int(retry_after)
+        else:
+            delay = RETRY_BASE_DELAY * 2**attempt
+        return delay + random.uniform(0, delay)
@@ -1,6 +1,7 @@
 from autoresearcher.data_sources.web_apis.base_web_api_data_loader import (
     BaseWebAPIDataLoader,
 )
+from concurrent.futures import ThreadPoolExecutor
 import jellyfish
 
 
@@ -57,6 +58,7 @@ class SemanticScholarLoader(BaseWebAPIDataLoader):
         year_range=None,
         keyword_combinations=None,
         weight_similarity=0.5,
+        max_concurrent=None,
     ):
         """
         Fetches and sorts papers from the SemanticScholar API.
@@ -67,6 +69,7 @@ class SemanticScholarLoader(BaseWebAPIDataLoader):
           year_range (tuple, optional): A tuple of two integers representing the start and end year of the search. Defaults to None.
           keyword_combinations (list, optional): A list of keyword combinations to search for. Defaults to None.
           weight_similarity (float, optional): The weight to give to the similarity score when sorting. Defaults to 0.5.
+          max_concurrent (int, optional): The maximum number of keyword combinations searched at the same time. Defaults to 5 with a partner key and 1 without, as the public API is rate limited more strictly.
         Returns:
           list: A list of the top `top_n` paper objects sorted by combined score.
         Examples:
@@ -77,8 +80,17 @@ class SemanticScholarLoader(BaseWebAPIDataLoader):
         if keyword_combinations is None:
             keyword_combinations = [search_query]
 
-        for combination in keyword_combinations:
-            papers.extend(self.fetch_data(combination, limit, year_range))
+        if max_concurrent is None:
+            max_concurrent = 5 if self.SS_key else 1
+
+        # Search the keyword combinations up to max_concurrent at a time, keeping their order
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            results = executor.map(
+                lambda combination: self.fetch_data(combination, limit, year_range),
+                keyword_combinations,
+            )
+            for result in results:
+                papers.extend(result)
 
         max_citations = max(papers, key=lambda x: x["citationCount"])["citationCount"]
 
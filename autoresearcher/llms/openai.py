@@ -1,6 +1,11 @@
+import aiohttp
+import asyncio
+import contextlib
 import openai
 import os
+import time
 from dotenv import load_dotenv
+from autoresearcher.utils.response_cache import response_cache
 
 load_dotenv()
 
@@ -10,9 +15,72 @@ assert OPENAI_API_KEY, "OPENAI_API_KEY environment variable is missing from .env
 # Configure OpenAI
 openai.api_key = OPENAI_API_KEY
 
+# Context window size, in tokens, of each model used
+CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+}
+
+# Retry settings for rate limits and transient network errors
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+)
+
+
+def get_model_name(use_gpt4: bool = False):
+    """
+    Gets the name of the OpenAI model to call.
+    Args:
+      use_gpt4 (bool, optional): Whether to use GPT-4 or GPT-3.5. Defaults to False.
+    Returns:
+      str: The model name.
+    Examples:
+      >>> get_model_name(use_gpt4=True)
+      "gpt-4"
+    """
+    return "gpt-4" if use_gpt4 else "gpt-3.5-turbo"
+
+
+@contextlib.asynccontextmanager
+async def openai_session(limit: int = 64):
+    """
+    Shares one pooled HTTP session between the async OpenAI calls made inside the context.
+    Args:
+      limit (int, optional): The maximum number of simultaneous connections. Defaults to 64.
+    Yields:
+      aiohttp.ClientSession: The session used for OpenAI requests.
+    Examples:
+      >>> async with openai_session():
+      ...     await asyncio.gather(openai_call_async("Hi"), openai_call_async("Hello"))
+    Notes:
+      Without a shared session the OpenAI SDK opens a new session, and a new TLS connection,
+      for every async request. If a session is already active it is reused.
+    """
+    session = openai.aiosession.get()
+    if session is not None:
+        yield session
+        return
+
+    connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        token = openai.aiosession.set(session)
+        try:
+            yield session
+        finally:
+            openai.aiosession.reset(token)
+
 
 def openai_call(
-    prompt: str, use_gpt4: bool = False, temperature: float = 0.5, max_tokens: int = 100
+    prompt: str,
+    use_gpt4: bool = False,
+    temperature: float = 0.5,
+    max_tokens: int = 100,
+    use_cache: bool = True,
 ):
     """
     Calls OpenAI API to generate a response to a given prompt.
@@ -21,6 +89,7 @@ def openai_call(
       use_gpt4 (bool, optional): Whether to use GPT-4 or GPT-3.5. Defaults to False.
       temperature (float, optional): The temperature of the response. Defaults to 0.5.
       max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 100.
+      use_cache (bool, optional): Whether to reuse and store responses in the response cache. Defaults to True.
     Returns:
       str: The generated response.
     Examples:
@@ -28,29 +97,130 @@ def openai_call(
       "I'm doing great, thanks for asking!"
     Notes:
       The OpenAI API key must be set in the environment variable OPENAI_API_KEY.
+      Rate limit and timeout errors are retried up to `MAX_RETRIES` times with exponential backoff.
+      Responses are cached on disk by prompt, model, temperature and max_tokens, see `ResponseCache`.
     """
-    if not use_gpt4:
-        # Call GPT-3.5 turbo model
-        messages = [{"role": "user", "content": prompt}]
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=1,
-            frequency_penalty=0,
-            presence_penalty=0,
-        )
-        return response.choices[0].message.content.strip()
-    else:
-        # Call GPT-4 chat model
-        messages = [{"role": "user", "content": prompt}]
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            n=1,
-            stop=None,
+    model = get_model_name(use_gpt4)
+    cache_key = response_cache.make_key(prompt, model, temperature, max_tokens)
+    if use_cache:
+        cached_response = response_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = openai.ChatCompletion.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            break
+        except RETRYABLE_ERRORS:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(RETRY_BASE_DELAY * 2**attempt)
+
+    content = response.choices[0].message.content.strip()
+    if use_cache:
+        response_cache.set(cache_key, content)
+    return content
+
+
+async def openai_call_async(
+    prompt: str,
+    use_gpt4: bool = False,
+    temperature: float = 0.5,
+    max_tokens: int = 100,
+    use_cache: bool = True,
+    stop=None,
+    stop_on_prefix: str = None,
+):
+    """
+    Asynchronously calls OpenAI API to generate a response to a given prompt.
+    Args:
+      prompt (str): The prompt to generate a response to.
+      use_gpt4 (bool, optional): Whether to use GPT-4 or GPT-3.5. Defaults to False.
+      temperature (float, optional): The temperature of the response. Defaults to 0.5.
+      max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 100.
+      use_cache (bool, optional): Whether to reuse and store responses in the response cache. Defaults to True.
+      stop (str or list, optional): Sequences where the API stops generating. Defaults to None.
+      stop_on_prefix (str, optional): Stream the response and stop reading it as soon as it starts with this text. Defaults to None.
+    Returns:
+      str: The generated response.
+    Examples:
+      >>> await openai_call_async("Hello, how are you?")
+      "I'm doing great, thanks for asking!"
+      >>> await openai_call_async(prompt, stop_on_prefix="No answer found")
+      "No answer found"
+    Notes:
+      Same as `openai_call`, but awaitable so that several requests can be in flight at once.
+      With `stop_on_prefix`, the request is streamed on its own HTTP session, which is closed as
+      soon as the response starts with the prefix. Closing the session drops the connection, so
+      the rest of the completion is not waited for and the server can stop generating it.
+    """
+    model = get_model_name(use_gpt4)
+    cache_key = response_cache.make_key(prompt, model, temperature, max_tokens, stop)
+    # The cache does blocking SQLite I/O, so keep it off the event loop
+    loop = asyncio.get_running_loop()
+    if use_cache:
+        cached_response = await loop.run_in_executor(
+            None, response_cache.get, cache_key
         )
-        return response.choices[0].message.content.strip()
+        if cached_response is not None:
+            return cached_response
+
+    stream = stop_on_prefix is not None
+    for attempt in range(MAX_RETRIES):
+        try:
+            params = dict(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=stop,
+            )
+            if stream:
+                content = await _acreate_streamed(stop_on_prefix, **params)
+            else:
+                response = await openai.ChatCompletion.acreate(**params)
+                content = response.choices[0].message.content.strip()
+            break
+        except RETRYABLE_ERRORS:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(RETRY_BASE_DELAY * 2**attempt)
+
+    if use_cache:
+        await loop.run_in_executor(None, response_cache.set, cache_key, content)
+    return content
+
+
+async def _acreate_streamed(stop_on_prefix, **params):
+    """
+    Streams a chat completion, dropping the connection once it starts with `stop_on_prefix`.
+    """
+    # The SDK never closes the HTTP response of an abandoned stream, so the request runs on
+    # a session of its own that records the response and closes it when reading stops
+    responses = []
+
+    async def on_request_end(session, context, end_params):
+        responses.append(end_params.response)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_end.append(on_request_end)
+
+    content = ""
+    async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
+        token = openai.aiosession.set(session)
+        try:
+            response = await openai.ChatCompletion.acreate(stream=True, **params)
+            async for chunk in response:
+                content += chunk.choices[0].delta.get("content", "")
+                if content.lstrip().startswith(stop_on_prefix):
+                    break
+        finally:
+            openai.aiosession.reset(token)
+            for http_response in responses:
+                http_response.close()
+    return content.strip()
@@ -1,6 +1,22 @@
+import functools
 import tiktoken
 
 
+@functools.lru_cache(maxsize=None)
+def get_encoding(model="gpt-4"):
+    """
+    Gets the tiktoken encoding for a model, building it only once.
+    Args:
+      model (str, optional): The model to get the encoding for. Defaults to "gpt-4".
+    Returns:
+      tiktoken.Encoding: The encoding used by `model`.
+    Notes:
+      Building an encoding is expensive and may download its BPE file, so it is
+      deferred to the first call and then reused.
+    """
+    return tiktoken.encoding_for_model(model)
+
+
 def count_tokens(text):
     """
     Counts the number of tokens in a given text.
@@ -14,8 +30,5 @@ def count_tokens(text):
     Notes:
       The encoding used is determined by the `tiktoken.encoding_for_model` function.
     """
-    # encoding = tiktoken.get_encoding("cl100k_base")
-    encoding = tiktoken.encoding_for_model("gpt-4")
-
-    tokens = encoding.encode(text)
+    tokens = get_encoding().encode(text)
     return len(tokens)
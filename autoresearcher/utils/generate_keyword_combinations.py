@@ -1,3 +1,4 @@
+import json
 from autoresearcher.llms.openai import openai_call
 from autoresearcher.utils.prompts import keyword_combination_prompt
 
@@ -13,12 +14,25 @@ def generate_keyword_combinations(research_question):
     Examples:
       >>> generate_keyword_combinations("What is the impact of AI on healthcare?")
       ["AI healthcare", "impact AI healthcare", "AI healthcare impact"]
+    Notes:
+      Falls back to the research question itself if the response does not contain a JSON list of combinations.
     """
     prompt = keyword_combination_prompt.format(research_question=research_question)
     response = openai_call(prompt, use_gpt4=False, temperature=0, max_tokens=200)
-    combinations = response.split("\n")
-    return [
-        combination.split(": ")[1]
+    # Ignore anything the model wraps around the JSON object, e.g. code fences
+    start, end = response.find("{"), response.rfind("}")
+    try:
+        combinations = json.loads(response[start : end + 1])["combinations"]
+    except (ValueError, KeyError, TypeError):
+        combinations = []
+    # Iterating a string would turn each character into a search query
+    if not isinstance(combinations, list):
+        combinations = []
+    combinations = [
+        combination.strip()
         for combination in combinations
-        if ": " in combination
+        if isinstance(combination, str)
+    ]
+    return [combination for combination in combinations if combination][:5] or [
+        research_question
     ]
@@ -1,5 +1,7 @@
+import functools
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,26 +9,50 @@ load_dotenv()
 EMAIL = os.getenv("EMAIL", "")
 assert EMAIL, "EMAIL environment variable is missing from .env"
 
+# Shared session so that concurrent lookups reuse pooled CiteAs connections
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
-def get_citation_by_doi(doi):
+
+@functools.lru_cache(maxsize=1024)
+def _fetch_citation(doi):
     """
-    Retrieves a citation for a given DOI.
+    Fetches the citation for a given DOI from CiteAs.
     Args:
       doi (str): The DOI of the citation to retrieve.
     Returns:
       str: The citation for the given DOI.
     Raises:
-      ValueError: If the response is not valid JSON.
+      ValueError: If CiteAs does not return a citation. The error message is the response body.
+    Notes:
+      Citations are immutable, so successful lookups are memoized per DOI. Failures raise
+      and are therefore not cached, so transient errors are retried on the next lookup.
+    """
+    url = f"https://api.citeas.org/product/{doi}?email={EMAIL}"
+    response = session.get(url)
+    try:
+        if not response.ok:
+            raise ValueError(f"CiteAs returned {response.status_code}")
+        return response.json()["citations"][0]["citation"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise ValueError(response.text)
+
+
+def get_citation_by_doi(doi):
+    """
+    Retrieves a citation for a given DOI.
+    Args:
+      doi (str): The DOI of the citation to retrieve.
+    Returns:
+      str: The citation for the given DOI, or the raw CiteAs response if it contains none.
     Notes:
       Requires an email address to be set in the EMAIL environment variable.
+      Successful lookups are memoized per DOI, see `_fetch_citation`.
     Examples:
       >>> get_citation_by_doi("10.1038/s41586-020-2003-7")
       "Liu, Y., Chen, X., Han, M., Li, Y., Li, L., Zhang, J., ... & Zhang, Y. (2020). A SARS-CoV-2 protein interaction map reveals targets for drug repurposing. Nature, 581(7809), 561-570."
     """
-    url = f"https://api.citeas.org/product/{doi}?email={EMAIL}"
-    response = requests.get(url)
     try:
-        data = response.json()
-        return data["citations"][0]["citation"]
-    except ValueError:
-        return response.text
+        return _fetch_citation(doi)
+    except ValueError as e:
+        return str(e)
@@ -1,3 +1,24 @@
+def partial_format(template, field, **kwargs):
+    """
+    Formats every field of a prompt template except one, for prompts filled many times.
+    Args:
+      template (str): The prompt template.
+      field (str): The name of the field left open. It must occur exactly once in `template`.
+      **kwargs: The values of the other fields.
+    Returns:
+      function: A function that takes the value of `field` and returns the complete prompt.
+    Examples:
+      >>> make_prompt = partial_format(extract_answer_prompt, "abstract", research_question="Why?")
+      >>> make_prompt("This is the abstract.")
+    Notes:
+      Filling the returned function is a plain string concatenation, so the template
+      is only parsed once instead of on every `str.format` call.
+    """
+    head, tail = template.split("{" + field + "}")
+    head, tail = head.format(**kwargs), tail.format(**kwargs)
+    return lambda value: head + value + tail
+
+
 literature_review_prompt =  """"
 `reset`
 `no quotes`
@@ -22,6 +43,26 @@ Now, using the concepts above, create a literature review for this research ques
 """
 
 
+summarize_answers_prompt = """
+`reset`
+`no quotes`
+`no explanations`
+`no prompt`
+`no self-reference`
+`no apologies`
+`no filler`
+`just answer`
+
+I will give you a list of research findings and a research question. Every research finding ends with its source after 'SOURCE: '.
+
+Condense the research findings into a shorter list of research findings that are relevant to this research question: '{research_question}'. Merge findings from the same source and end every condensed finding with its source in the same 'SOURCE: ' format. Separate the condensed findings with a blank line.
+
+These are the research findings:
+
+{answer_list}
+"""
+
+
 extract_answer_prompt = """
 `reset`
 `no quotes`
@@ -39,7 +80,7 @@ If the answer is not in the abstract, then you are only allowed to respond with
 This is the abstract: {abstract}
 """
 
-keyword_combination_prompt = """
+extract_answers_batch_prompt = """
 `reset`
 `no quotes`
 `no explanations`
@@ -49,10 +90,17 @@ keyword_combination_prompt = """
 `no filler`
 `just answer`
 
-Generate several keyword combinations based on the following research question: {research_question}. 
-Don't generate more than 5 keyword combinations.
+I will give you the abstracts of several academic papers as a JSON list of objects with an "id" and an "abstract". Extract the answer to this research question: {research_question} from each abstract.
 
-The output should be structured like this:
-Write "KeywordCombination:" and then list the keywords like so "Keyword,Keyword,Keyword"
+If the answer is not in an abstract, then you are only allowed to use 'No answer found.' as the answer for that abstract.
 
-"""
\ No newline at end of file
+Respond only with a JSON list containing one object per abstract with its "id" and the "answer", like this: [{{"id": 0, "answer": "..."}}]
+
+These are the abstracts: {abstracts}
+"""
+
+keyword_combination_prompt = """
+Generate up to 5 keyword combinations to search for academic papers on this research question: {research_question}
+
+Respond only with JSON like this: {{"combinations": ["Keyword,Keyword,Keyword"]}}
+"""
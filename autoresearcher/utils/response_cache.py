@@ -0,0 +1,110 @@
+import hashlib
+import os
+from collections import OrderedDict
+import re
+import sqlite3
+import threading
+
+CACHE_DIR = os.getenv("AUTORESEARCHER_CACHE_DIR", ".openai_cache")
+
+
+class ResponseCache:
+    def __init__(self, directory=CACHE_DIR, memory_size=4096):
+        """
+        Initializes the ResponseCache class.
+        Args:
+          directory (str, optional): The directory the cache database is stored in. Defaults to `CACHE_DIR`.
+          memory_size (int, optional): The number of recently used responses also kept in memory. Defaults to 4096.
+        Returns:
+          None
+        Notes:
+          The database is only created once the cache is first used.
+          Recently used responses are served from an in-process LRU without touching the database.
+        """
+        self.directory = directory
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt, model, temperature, max_tokens, stop=None):
+        """
+        Builds the cache key for an OpenAI request.
+        Args:
+          prompt (str): The prompt of the request.
+          model (str): The model the request is sent to.
+          temperature (float): The temperature of the request.
+          max_tokens (int): The maximum number of tokens to generate.
+          stop (str or list, optional): The stop sequences of the request. Defaults to None.
+        Returns:
+          str: A SHA-256 hex digest identifying the request.
+        Notes:
+          Whitespace in the prompt is normalized so that formatting-only differences share a key.
+        """
+        prompt = re.sub(r"\s+", " ", prompt.strip())
+        key = f"{model}|{temperature}|{max_tokens}|{prompt}"
+        if stop is not None:
+            key = f"{stop}|{key}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _connect(self):
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._connection = sqlite3.connect(
+                os.path.join(self.directory, "responses.sqlite"),
+                check_same_thread=False,
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)"
+            )
+        return self._connection
+
+    def _remember(self, key, response):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Looks up a cached response.
+        Args:
+          key (str): The cache key, see `make_key`.
+        Returns:
+          str: The cached response, or None if there is none.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            row = (
+                self._connect()
+                .execute("SELECT response FROM responses WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, key, response):
+        """
+        Stores a response in the cache.
+        Args:
+          key (str): The cache key, see `make_key`.
+          response (str): The response to store.
+        Returns:
+          None
+        """
+        with self._lock:
+            self._remember(key, response)
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                (key, response),
+            )
+            connection.commit()
+
+
+response_cache = ResponseCache()
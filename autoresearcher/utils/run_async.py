@@ -0,0 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_async(coroutine):
+    """
+    Runs a coroutine to completion from synchronous code.
+    Args:
+      coroutine (coroutine): The coroutine to run.
+    Returns:
+      Any: The result of the coroutine.
+    Examples:
+      >>> run_async(extract_answers_from_papers_async(papers, research_question))
+      ['Answer 1 SOURCE: Citation 1', 'Answer 2 SOURCE: Citation 2']
+    Notes:
+      `asyncio.run` cannot be called while an event loop is running, e.g. in Jupyter or
+      from async code. In that case the coroutine gets its own event loop in a worker
+      thread, and the caller blocks until it is done.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
@@ -0,0 +1,141 @@
+import json
+import os
+import re
+import threading
+from autoresearcher.utils.response_cache import CACHE_DIR
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    SentenceTransformer = None
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        directory=CACHE_DIR,
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        threshold=0.92,
+    ):
+        """
+        Initializes the SemanticCache class.
+        Args:
+          directory (str, optional): The directory the cached embeddings and answers are stored in. Defaults to `CACHE_DIR`.
+          model_name (str, optional): The sentence-transformers model used to embed abstracts. Defaults to "sentence-transformers/all-MiniLM-L6-v2".
+          threshold (float, optional): The minimum cosine similarity between abstracts for a cached answer to be reused. Defaults to 0.92.
+        Returns:
+          None
+        Notes:
+          Requires the optional `numpy` and `sentence-transformers` packages
+          (`pip install autoresearcher[semantic-cache]`). The model and the stored
+          entries are only loaded once the cache is first used.
+          Every entry is stored with its research question and is only reused for the same
+          question, since the abstract dominates the embedding of a combined query.
+        """
+        self.directory = directory
+        self.model_name = model_name
+        self.threshold = threshold
+        self._model = None
+        self._embeddings = None
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def _embeddings_path(self):
+        return os.path.join(self.directory, "semantic_embeddings.npy")
+
+    @property
+    def _entries_path(self):
+        return os.path.join(self.directory, "semantic_entries.json")
+
+    @staticmethod
+    def _normalize_question(research_question):
+        return re.sub(r"\s+", " ", research_question.strip()).lower()
+
+    def _load(self):
+        if SentenceTransformer is None:
+            raise ImportError(
+                "The semantic cache requires numpy and sentence-transformers. "
+                "Install them with `pip install autoresearcher[semantic-cache]`."
+            )
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        if self._entries is None:
+            if os.path.exists(self._entries_path):
+                self._embeddings = np.load(self._embeddings_path)
+                with open(self._entries_path) as f:
+                    self._entries = json.load(f)
+            else:
+                dimension = self._model.get_sentence_embedding_dimension()
+                self._embeddings = np.empty((0, dimension), dtype=np.float32)
+                self._entries = []
+
+    def embed(self, texts):
+        """
+        Embeds a list of abstracts.
+        Args:
+          texts (list): The abstracts to embed.
+        Returns:
+          numpy.ndarray: One normalized embedding per abstract.
+        """
+        with self._lock:
+            self._load()
+            return self._model.encode(
+                texts, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32)
+
+    def lookup(self, research_question, embeddings):
+        """
+        Looks up the cached answers to a research question for the closest abstracts.
+        Args:
+          research_question (str): The research question the answers must belong to.
+          embeddings (numpy.ndarray): Abstract embeddings, as returned by `embed`.
+        Returns:
+          list: The cached answer for every abstract whose closest entry for the same research question reaches `threshold`, None otherwise.
+        """
+        question = self._normalize_question(research_question)
+        with self._lock:
+            self._load()
+            rows = [
+                idx
+                for idx, entry in enumerate(self._entries)
+                if entry["question"] == question
+            ]
+            if not rows:
+                return [None] * len(embeddings)
+            # Embeddings are normalized, so the dot product is the cosine similarity
+            similarities = embeddings @ self._embeddings[rows].T
+            best = similarities.argmax(axis=1)
+            return [
+                self._entries[rows[idx]]["answer"]
+                if similarities[row, idx] >= self.threshold
+                else None
+                for row, idx in enumerate(best)
+            ]
+
+    def add(self, research_question, embeddings, answers):
+        """
+        Stores the answers to a research question for the given abstract embeddings and persists the cache.
+        Args:
+          research_question (str): The research question the answers belong to.
+          embeddings (numpy.ndarray): Abstract embeddings, as returned by `embed`.
+          answers (list): One answer per abstract.
+        Returns:
+          None
+        """
+        question = self._normalize_question(research_question)
+        with self._lock:
+            self._load()
+            self._embeddings = np.vstack([self._embeddings, embeddings])
+            self._entries.extend(
+                {"question": question, "answer": answer} for answer in answers
+            )
+            os.makedirs(self.directory, exist_ok=True)
+            np.save(self._embeddings_path, self._embeddings)
+            with open(self._entries_path, "w") as f:
+                json.dump(self._entries, f)
+
+
+semantic_cache = SemanticCache()
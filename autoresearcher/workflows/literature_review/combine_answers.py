@@ -1,6 +1,23 @@
-from autoresearcher.llms.openai import openai_call
-from autoresearcher.utils.prompts import literature_review_prompt
+import asyncio
+from autoresearcher.llms.openai import (
+    CONTEXT_WINDOWS,
+    get_model_name,
+    openai_call,
+    openai_call_async,
+    openai_session,
+)
+from autoresearcher.utils.prompts import literature_review_prompt, summarize_answers_prompt
 from autoresearcher.utils.count_tokens import count_tokens
+from autoresearcher.utils.run_async import run_async
+
+# Bounds for the number of tokens generated for the literature review
+MIN_OUTPUT_TOKENS = 256
+MAX_OUTPUT_TOKENS = 2000
+# Headroom for the chat message formatting tokens not counted by count_tokens
+TOKEN_SAFETY_MARGIN = 64
+# Token limits for the groups of answers summarized when they do not fit in one prompt
+MAX_GROUP_TOKENS = 2500
+MAX_SUMMARY_TOKENS = 1000
 
 
 # Combine answers into a concise literature review using OpenAI API
@@ -14,25 +31,100 @@ def combine_answers(answers, research_question, use_gpt4=False, temperature=0.1)
       temperature (float, optional): The temperature to use for the OpenAI API. Defaults to 0.1.
     Returns:
       str: The literature review.
+    Raises:
+      ValueError: If a single answer leaves less than `MIN_OUTPUT_TOKENS` of the model's context window for the review.
     Examples:
       >>> answers = ["Answer 1", "Answer 2"]
       >>> research_question = "What is the impact of AI on society?"
       >>> combine_answers(answers, research_question)
       "The impact of AI on society is significant. Answer 1...Answer 2..."
+    Notes:
+      If the answers do not fit in the model's context window, they are first condensed in
+      groups of at most `MAX_GROUP_TOKENS` tokens with concurrent GPT-3.5 calls, until they fit.
     """
-    answer_list = "\n\n".join(answers)
-    prompt = literature_review_prompt.format(
-        research_question=research_question, answer_list=answer_list
-    )
+    context_window = CONTEXT_WINDOWS[get_model_name(use_gpt4)]
+
+    while True:
+        answer_list = "\n\n".join(answers)
+        prompt = literature_review_prompt.format(
+            research_question=research_question, answer_list=answer_list
+        )
 
-    # Calculate the tokens in the input
-    input_tokens = count_tokens(prompt)
+        # Calculate the tokens in the input
+        input_tokens = count_tokens(prompt)
 
-    # Calculate the remaining tokens for the response
-    remaining_tokens = 4080 - input_tokens
-    max_tokens = max(remaining_tokens, 0)
+        # Calculate the remaining tokens for the response
+        remaining_tokens = context_window - input_tokens - TOKEN_SAFETY_MARGIN
+        if remaining_tokens >= MIN_OUTPUT_TOKENS:
+            break
+        if len(answers) == 1:
+            raise ValueError(
+                f"The answers use {input_tokens} tokens, which leaves too little of the context window for the literature review"
+            )
+        answers = run_async(
+            summarize_answer_groups(group_answers(answers), research_question)
+        )
+
+    max_tokens = min(remaining_tokens, MAX_OUTPUT_TOKENS)
     literature_review = openai_call(
         prompt, use_gpt4=use_gpt4, temperature=temperature, max_tokens=max_tokens
     )
 
     return literature_review
+
+
+def group_answers(answers, max_group_tokens=MAX_GROUP_TOKENS):
+    """
+    Splits a list of answers into consecutive groups that stay under a token limit.
+    Args:
+      answers (list): A list of answers.
+      max_group_tokens (int, optional): The maximum number of tokens per group. Defaults to `MAX_GROUP_TOKENS`.
+    Returns:
+      list: A list of groups, each a list of answers.
+    Examples:
+      >>> group_answers(["Answer 1", "Answer 2", "Answer 3"], max_group_tokens=6)
+      [["Answer 1", "Answer 2"], ["Answer 3"]]
+    Notes:
+      An answer longer than `max_group_tokens` is put in a group of its own.
+    """
+    groups = []
+    group, group_tokens = [], 0
+    for answer in answers:
+        answer_tokens = count_tokens(answer)
+        if group and group_tokens + answer_tokens > max_group_tokens:
+            groups.append(group)
+            group, group_tokens = [], 0
+        group.append(answer)
+        group_tokens += answer_tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+async def summarize_answer_groups(groups, research_question):
+    """
+    Concurrently condenses each group of answers into a shorter list of answers.
+    Args:
+      groups (list): Groups of answers, as returned by `group_answers`.
+      research_question (str): The research question the answers relate to.
+    Returns:
+      list: One condensed answer list per group, keeping the answers' sources.
+    Examples:
+      >>> await summarize_answer_groups([["Answer 1", "Answer 2"], ["Answer 3"]], research_question)
+      ["Condensed answers 1 and 2", "Condensed answer 3"]
+    """
+    async with openai_session():
+        return await asyncio.gather(
+            *[
+                openai_call_async(
+                    summarize_answers_prompt.format(
+                        research_question=research_question,
+                        answer_list="\n\n".join(group),
+                    ),
+                    use_gpt4=False,
+                    temperature=0,
+                    max_tokens=MAX_SUMMARY_TOKENS,
+                )
+                for group in groups
+            ]
+        )
@@ -1,13 +1,35 @@
 #!/usr/bin/env python3
+import asyncio
+import json
+import logging
 from autoresearcher.utils.get_citations import get_citation_by_doi
-from termcolor import colored
-from autoresearcher.utils.prompts import extract_answer_prompt
-from autoresearcher.llms.openai import openai_call
+from autoresearcher.utils.run_async import run_async
+from autoresearcher.utils.semantic_cache import semantic_cache
+from autoresearcher.utils.prompts import (
+    extract_answer_prompt,
+    extract_answers_batch_prompt,
+    partial_format,
+)
+from autoresearcher.llms.openai import openai_call_async, openai_session
+
+logger = logging.getLogger(__name__)
+
+# Abstracts are truncated to this many characters before being sent to OpenAI
+MAX_ABSTRACT_LENGTH = 2000
+# The answer for papers whose abstract does not answer the research question
+DEFAULT_ANSWER = "No answer found."
 
 
 # Extract answers from paper abstracts
 def extract_answers_from_papers(
-    papers, research_question, use_gpt4=False, temperature=0, max_tokens=150
+    papers,
+    research_question,
+    use_gpt4=False,
+    temperature=0,
+    max_tokens=150,
+    max_concurrent=10,
+    batch_size=10,
+    use_semantic_cache=False,
 ):
     """
     Extracts answers from paper abstracts.
@@ -16,37 +38,238 @@ def extract_answers_from_papers(
       research_question (str): The research question to answer.
       use_gpt4 (bool, optional): Whether to use GPT-4 for answer extraction. Defaults to False.
       temperature (float, optional): The temperature for GPT-4 answer extraction. Defaults to 0.
-      max_tokens (int, optional): The maximum number of tokens for GPT-4 answer extraction. Defaults to 150.
+      max_tokens (int, optional): The maximum number of tokens per answer. Defaults to 150.
+      max_concurrent (int, optional): The maximum number of OpenAI requests in flight at the same time. Defaults to 10.
+      batch_size (int, optional): The number of abstracts sent in a single OpenAI request. Defaults to 10.
+      use_semantic_cache (bool, optional): Whether to reuse answers for semantically similar abstracts from earlier runs of the same research question. Defaults to False.
     Returns:
       list: A list of answers extracted from the paper abstracts.
     Examples:
       >>> extract_answers_from_papers(papers, research_question)
       ['Answer 1 SOURCE: Citation 1', 'Answer 2 SOURCE: Citation 2']
+    Notes:
+      Runs its own event loop, in a worker thread if one is already running.
+      From async code, prefer awaiting `extract_answers_from_papers_async`.
+    """
+    return run_async(
+        extract_answers_from_papers_async(
+            papers,
+            research_question,
+            use_gpt4=use_gpt4,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_concurrent=max_concurrent,
+            batch_size=batch_size,
+            use_semantic_cache=use_semantic_cache,
+        )
+    )
+
+
+def get_abstract(paper):
+    """
+    Gets the abstract of a paper, truncated to `MAX_ABSTRACT_LENGTH` characters.
+    Args:
+      paper (dict): A paper as returned by Semantic Scholar.
+    Returns:
+      str: The abstract, or an empty string if the paper has none.
+    Examples:
+      >>> get_abstract({"abstract": None})
+      ''
+    """
+    return (paper.get("abstract") or "")[:MAX_ABSTRACT_LENGTH].strip()
+
+
+def normalize_answer(answer):
+    """
+    Maps every variant of the default answer, and empty answers, to `DEFAULT_ANSWER`.
+    Args:
+      answer (str): An answer returned by the model, or None.
+    Returns:
+      str: The stripped answer, or `DEFAULT_ANSWER` if it is empty or a variant of it.
+    Examples:
+      >>> normalize_answer("No answer found")
+      'No answer found.'
+    """
+    answer = (answer or "").strip()
+    if not answer or answer.startswith("No answer found"):
+        return DEFAULT_ANSWER
+    return answer
+
+
+def parse_batch_answers(response, batch_length):
+    """
+    Parses the answers returned for a batch of abstracts.
+    Args:
+      response (str): The model output, a JSON list of objects with an "id" and an "answer".
+      batch_length (int): The number of abstracts in the batch.
+    Returns:
+      list: The answers, ordered by id and normalized with `normalize_answer`.
+    Raises:
+      ValueError: If the response is not valid JSON or does not contain an answer for every abstract.
+    Examples:
+      >>> parse_batch_answers('[{"id": 0, "answer": "Answer 1"}]', 1)
+      ['Answer 1']
+    """
+    # Ignore anything the model wraps around the JSON list, e.g. code fences
+    start, end = response.find("["), response.rfind("]")
+    try:
+        items = json.loads(response[start : end + 1])
+        answers = {
+            int(item["id"]): normalize_answer(
+                item["answer"] if isinstance(item["answer"], str) else None
+            )
+            for item in items
+        }
+    except (TypeError, KeyError) as e:
+        raise ValueError(f"Malformed batch response: {e}")
+    if sorted(answers) != list(range(batch_length)):
+        raise ValueError("Batch response does not contain an answer for every abstract")
+    return [answers[idx] for idx in range(batch_length)]
+
+
+async def extract_answers_from_papers_async(
+    papers,
+    research_question,
+    use_gpt4=False,
+    temperature=0,
+    max_tokens=150,
+    max_concurrent=10,
+    batch_size=10,
+    use_semantic_cache=False,
+):
+    """
+    Concurrently extracts answers from paper abstracts.
+    Args:
+      papers (list): A list of papers.
+      research_question (str): The research question to answer.
+      use_gpt4 (bool, optional): Whether to use GPT-4 for answer extraction. Defaults to False.
+      temperature (float, optional): The temperature for GPT-4 answer extraction. Defaults to 0.
+      max_tokens (int, optional): The maximum number of tokens per answer. Defaults to 150.
+      max_concurrent (int, optional): The maximum number of OpenAI requests in flight at the same time. Defaults to 10.
+      batch_size (int, optional): The number of abstracts sent in a single OpenAI request. Defaults to 10.
+      use_semantic_cache (bool, optional): Whether to reuse answers for semantically similar abstracts from earlier runs of the same research question. Defaults to False.
+    Returns:
+      list: A list of answers extracted from the paper abstracts, in the order of `papers`.
+    Examples:
+      >>> await extract_answers_from_papers_async(papers, research_question)
+      ['Answer 1 SOURCE: Citation 1', 'Answer 2 SOURCE: Citation 2']
+    Notes:
+      Abstracts are truncated to `MAX_ABSTRACT_LENGTH` characters and papers without one are skipped.
+      Abstracts are sent `batch_size` at a time with the instructions included once per request.
+      If a batch response cannot be parsed, its abstracts are retried one request per paper.
+      Citations are only fetched for papers an answer was found in.
+      With `use_semantic_cache`, papers whose abstract closely matches one already answered for
+      the same research question reuse that answer without calling OpenAI, see `SemanticCache`.
     """
     answers = []
-    default_answer = "No answer found."
+    semaphore = asyncio.Semaphore(max_concurrent)
+    loop = asyncio.get_running_loop()
+    make_extract_answer_prompt = partial_format(
+        extract_answer_prompt, "abstract", research_question=research_question
+    )
+    make_extract_answers_batch_prompt = partial_format(
+        extract_answers_batch_prompt, "abstracts", research_question=research_question
+    )
 
-    for paper in papers:
-        abstract = paper.get("abstract", "")
-        title = colored(paper.get("title", ""), "magenta", attrs=["bold"])
+    async def fetch_citation(paper):
         if "externalIds" in paper and "DOI" in paper["externalIds"]:
-            citation = get_citation_by_doi(paper["externalIds"]["DOI"])
-        else:
-            citation = paper["url"]
-        prompt = extract_answer_prompt.format(
-            research_question=research_question, abstract=abstract
+            return await loop.run_in_executor(
+                None, get_citation_by_doi, paper["externalIds"]["DOI"]
+            )
+        return paper["url"]
+
+    async def process_paper(paper):
+        prompt = make_extract_answer_prompt(get_abstract(paper))
+        async with semaphore:
+            # Stop reading as soon as the model settles on the default answer
+            answer = await openai_call_async(
+                prompt,
+                use_gpt4=use_gpt4,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n"],
+                stop_on_prefix="No answer found",
+            )
+        return normalize_answer(answer)
+
+    async def process_batch(batch):
+        if len(batch) == 1:
+            return [await process_paper(batch[0])]
+
+        abstracts = json.dumps(
+            [
+                {"id": idx, "abstract": get_abstract(paper)}
+                for idx, paper in enumerate(batch)
+            ]
+        )
+        prompt = make_extract_answers_batch_prompt(abstracts)
+        async with semaphore:
+            response = await openai_call_async(
+                prompt,
+                use_gpt4=use_gpt4,
+                temperature=temperature,
+                max_tokens=max_tokens * len(batch),
+            )
+        try:
+            return parse_batch_answers(response, len(batch))
+        except ValueError:
+            return await asyncio.gather(*[process_paper(paper) for paper in batch])
+
+    if use_semantic_cache:
+        abstracts = [get_abstract(paper)[:1000] for paper in papers]
+        embeddings = await loop.run_in_executor(None, semantic_cache.embed, abstracts)
+        cached_answers = await loop.run_in_executor(
+            None, semantic_cache.lookup, research_question, embeddings
         )
-        answer = openai_call(
-            prompt, use_gpt4=use_gpt4, temperature=temperature, max_tokens=max_tokens
+    else:
+        cached_answers = [None] * len(papers)
+    # Papers without an abstract cannot contain an answer, so they are not sent to OpenAI
+    for idx, paper in enumerate(papers):
+        if not get_abstract(paper):
+            cached_answers[idx] = DEFAULT_ANSWER
+    uncached = [idx for idx, answer in enumerate(cached_answers) if answer is None]
+    uncached_papers = [papers[idx] for idx in uncached]
+
+    batches = [
+        uncached_papers[i : i + batch_size]
+        for i in range(0, len(uncached_papers), batch_size)
+    ]
+    async with openai_session(limit=max_concurrent):
+        batch_answers = await asyncio.gather(
+            *[process_batch(batch) for batch in batches]
+        )
+    new_answers = [answer for batch in batch_answers for answer in batch]
+    if use_semantic_cache and new_answers:
+        await loop.run_in_executor(
+            None,
+            semantic_cache.add,
+            research_question,
+            embeddings[uncached],
+            new_answers,
+        )
+
+    paper_answers = list(cached_answers)
+    for idx, answer in zip(uncached, new_answers):
+        paper_answers[idx] = answer
+
+    # Only papers with an answer end up in the review, so only they need a citation
+    citations = iter(
+        await asyncio.gather(
+            *[
+                fetch_citation(paper)
+                for paper, answer in zip(papers, paper_answers)
+                if answer != DEFAULT_ANSWER
+            ]
         )
+    )
 
-        print(f"Processing paper: {title}")
+    for paper, answer in zip(papers, paper_answers):
+        logger.info("Processing paper: %s", paper.get("title", ""))
 
-        answer_with_citation = f"{answer}\n{citation}"
-        if answer != default_answer:
-            answer_with_citation = f"{answer} SOURCE: {citation}"
+        if answer != DEFAULT_ANSWER:
+            answer_with_citation = f"{answer} SOURCE: {next(citations)}"
             answers.append(answer_with_citation)
-            print(colored(f"Answer found!", "green"))
-            print(colored(f"{answer_with_citation}", "cyan"))
+            logger.info("Answer found!")
+            logger.info(answer_with_citation)
 
     return answers
@@ -14,8 +14,8 @@ def extract_citations(answers):
     """
     citations = []
     for answer in answers:
-        citation_start = answer.rfind("SOURCE: ")
-        if citation_start != -1:
-            citation = answer[citation_start + len("SOURCE: ") :]
-            citations.append(citation)
+        # Single scan from the end; the separator is empty if there is no source
+        _, separator, citation = answer.rpartition("SOURCE: ")
+        if separator:
+            citations.append(citation.strip())
     return citations
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from termcolor import colored
+import logging
 from autoresearcher.llms.openai import openai_call
 from autoresearcher.workflows.literature_review.extract_citations import (
     extract_citations,
@@ -15,6 +15,8 @@ from autoresearcher.data_sources.web_apis.semantic_scholar_loader import (
     SemanticScholarLoader,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def literature_review(research_question, output_file=None, SS_key=None):
     """
@@ -24,6 +26,8 @@ def literature_review(research_question, output_file=None, SS_key=None):
       output_file (str, optional): The file path to save the literature review to.
     Returns:
       str: The generated literature review.
+    Notes:
+      Progress is logged at INFO level to the `autoresearcher` loggers, which are silent by default.
     Examples:
       >>> literature_review('What is the impact of AI on healthcare?')
       Research question: What is the impact of AI on healthcare?
@@ -43,35 +47,31 @@ def literature_review(research_question, output_file=None, SS_key=None):
     """
     SemanticScholar = SemanticScholarLoader(SS_key)
 
-    print(
-        colored(
-            f"Research question: {research_question}", "yellow", attrs=["bold", "blink"]
-        )
-    )
-    print(colored("Auto Researcher initiated!", "yellow"))
+    logger.info("Research question: %s", research_question)
+    logger.info("Auto Researcher initiated!")
 
     # Generate keyword combinations
-    print(colored("Generating keyword combinations...", "yellow"))
+    logger.info("Generating keyword combinations...")
     keyword_combinations = generate_keyword_combinations(research_question)
-    print(colored("Keyword combinations generated!", "green"))
+    logger.info("Keyword combinations generated!")
 
     # Fetch the top 20 papers for the research question
     search_query = research_question
-    print(colored("Fetching top 20 papers...", "yellow"))
+    logger.info("Fetching top 20 papers...")
     top_papers = SemanticScholar.fetch_and_sort_papers(
         search_query, keyword_combinations=keyword_combinations, year_range="2000-2023"
     )
-    print(colored("Top 20 papers fetched!", "green"))
+    logger.info("Top 20 papers fetched!")
 
     # Extract answers and from the top 20 papers
-    print(colored("Extracting research findings from papers...", "yellow"))
+    logger.info("Extracting research findings from papers...")
     answers = extract_answers_from_papers(top_papers, research_question)
-    print(colored("Research findings extracted!", "green"))
+    logger.info("Research findings extracted!")
 
     # Combine answers into a concise academic literature review
-    print(colored("Synthesizing answers...", "yellow"))
+    logger.info("Synthesizing answers...")
     literature_review = combine_answers(answers, research_question)
-    print(colored("Literature review generated!", "green"))
+    logger.info("Literature review generated!")
 
     # Extract citations from answers and append a references list to the literature review
     citations = extract_citations(answers)
@@ -86,14 +86,14 @@ def literature_review(research_question, output_file=None, SS_key=None):
         [f"{i + 1}. {combination}" for i, combination in enumerate(keyword_combinations)]
     )
 
-    # Print the academic literature review
-    print(colored("Academic Literature Review:", "cyan"), literature_review, "\n")
+    # Log the academic literature review
+    logger.info("Academic Literature Review: %s\n", literature_review)
 
     # Save the literature review to a file if the output_file argument is provided
     if output_file:
         with open(output_file, "w") as f:
             f.write(literature_review)
-        print(colored(f"Literature review saved to {output_file}", "green"))
+        logger.info("Literature review saved to %s", output_file)
 
     return literature_review
 
@@ -122,4 +122,5 @@ if __name__ == "__main__":
             "No research question provided. Usage: python literature_review.py 'My research question' 'optional_output_file.txt'"
         )
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     literature_review(research_question, output_file, SS_key)
@@ -22,12 +22,18 @@ setup(
     include_package_data=True,
     install_requires=[
         "openai==0.27.0",
+        "aiohttp",
         "python-dotenv==1.0.0",
         "requests==2.26.0",
-        "termcolor==1.1.0",
         "jellyfish==0.11.2",
         "tiktoken==0.3.3",
         "setuptools>=42",
         "wheel"
     ],
+    extras_require={
+        "semantic-cache": [
+            "numpy",
+            "sentence-transformers",
+        ],
+    },
 )